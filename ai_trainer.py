@@ -4,8 +4,14 @@ import math
 import pickle
 import os
 import sys
+import time
 
-from environment import Car
+from champion import decision_from_outputs, sensor_inputs
+from environment import Car, TRACK1_CHECKPOINTS
+from stats_store import StatsReporter
+
+class TrainingStopped(Exception):
+    pass
 
 class SimpleAITrainer:
     def __init__(self):
@@ -15,16 +21,20 @@ class SimpleAITrainer:
         self.screen_width = 1280
         self.screen_height = 720
         self.time_limits = {'early': 15, 'mid': 30, 'late': 60}
+        self.fitness_weights = {'alive': 3, 'checkpoint': 50, 'lap': 1000,
+                                'speed': 0.5, 'crash': 25, 'progress': 0.1}
+        self.fps = 60
+        self.generations = 50
         self.config_file = "neat_config.txt"
+        self.stats_file = time.strftime("training_stats_%Y%m%d_%H%M%S.bin")
+        self.overwrite_stats = False
+        self.winner_file = "best_simple_ai.pkl"
+        self.stats_reporter = None
+        self.training_error = None
         self.setup_checkpoints()
     
     def setup_checkpoints(self):
-        self.checkpoints = [
-            (407, 353, 50), (618, 326, 50), (782, 125, 50),
-            (944, 390, 50), (1177, 529, 50), (923, 642, 50),
-            (608, 560, 50), (362, 636, 50), (125, 520, 50),
-            (145, 281, 50), (170, 75, 50), (348, 136, 50)
-        ]
+        self.checkpoints = list(TRACK1_CHECKPOINTS)
 
     def create_cars(self, genomes, config):
         self.cars = []
@@ -50,40 +60,23 @@ class SimpleAITrainer:
         
         car = self.cars[car_index]
         network = self.networks[car_index]
-        inputs = []
-        
-        for sensor_reading in car.sensor_readings:
-            inputs.append(sensor_reading / car.sensor_range)
-        inputs.append(car.speed / car.max_speed)
-        inputs.append(car.angle / 360.0)
-        
-        outputs = network.activate(inputs)
-        accelerate = outputs[0] > 0.5
-        brake = outputs[1] > 0.5
-        steering_output = outputs[2]
-        
-        if steering_output < -0.33:
-            steer = -1
-        elif steering_output > 0.33:
-            steer = 1
-        else:
-            steer = 0
-        
-        return (accelerate, brake, steer)
+        outputs = network.activate(sensor_inputs(car))
+        return decision_from_outputs(outputs)
     
     def calculate_fitness(self, car, time_alive):
-        fitness = time_alive * 3
-        fitness += car.checkpoints_reached * 50
-        fitness += car.laps_completed * 1000
-        fitness += car.speed * 0.5
+        weights = self.fitness_weights
+        fitness = time_alive * weights['alive']
+        fitness += car.checkpoints_reached * weights['checkpoint']
+        fitness += car.laps_completed * weights['lap']
+        fitness += car.speed * weights['speed']
         
         if car.crashed:
-            fitness -= 25
+            fitness -= weights['crash']
         
         if hasattr(car, 'checkpoints') and car.current_checkpoint < len(car.checkpoints):
             checkpoint_x, checkpoint_y, checkpoint_radius = car.checkpoints[car.current_checkpoint]
             distance = math.sqrt((car.position.x - checkpoint_x) ** 2 + (car.position.y - checkpoint_y) ** 2)
-            progress_bonus = max(0, (checkpoint_radius - distance) * 0.1)
+            progress_bonus = max(0, (checkpoint_radius - distance) * weights['progress'])
             fitness += progress_bonus
         
         return max(0, fitness)
@@ -100,19 +93,28 @@ class SimpleAITrainer:
         self.generation += 1
         time_limit = self.get_time_limit()
         self.create_cars(genomes, config)
+        headless = screen is None
         start_time = pygame.time.get_ticks()
+        frame = 0
         
         while True:
-            current_time = pygame.time.get_ticks()
-            time_alive = (current_time - start_time) / 1000.0
+            # Without a display there is no frame cap, so time is counted in simulated frames
+            if headless:
+                time_alive = frame / self.fps
+            else:
+                current_time = pygame.time.get_ticks()
+                time_alive = (current_time - start_time) / 1000.0
+            frame += 1
             
             if time_alive >= time_limit:
                 break
             
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
+            if not headless:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        return False
             
+            simulate_start = time.perf_counter()
             active_cars = 0
             for i, car in enumerate(self.cars):
                 if car.laps_completed < 2:
@@ -127,10 +129,20 @@ class SimpleAITrainer:
                 if fitness > self.best_fitness_ever:
                     self.best_fitness_ever = fitness
             
-            self.draw_training_screen(screen, font, track_image, finish_image, time_alive, time_limit, active_cars)
-            pygame.display.flip()
-            clock.tick(60)
+            draw_start = time.perf_counter()
+            if not headless:
+                self.draw_training_screen(screen, font, track_image, finish_image, time_alive, time_limit, active_cars)
+                pygame.display.flip()
+            draw_end = time.perf_counter()
+            if not headless:
+                clock.tick(self.fps)
+            
+            if self.stats_reporter:
+                self.stats_reporter.record_phase('simulate', draw_start - simulate_start)
+                self.stats_reporter.record_phase('draw', draw_end - draw_start)
         
+        if self.stats_reporter:
+            self.stats_reporter.record_cars(self.cars)
         return True
 
     def draw_training_screen(self, screen, font, track_image, finish_image, time_alive, time_limit, active_cars):
@@ -195,23 +207,30 @@ class SimpleAITrainer:
             text = font.render(f"Car {car.id}: {fitness:.1f}", True, (255, 255, 255))
             screen.blit(text, (start_x + bar_width + 10, y_pos))
     
-    def start_training(self, screen, clock, font, track_image, finish_image):
+    def start_training(self, screen=None, clock=None, font=None, track_image=None, finish_image=None, reporters=()):
         config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
                            neat.DefaultSpeciesSet, neat.DefaultStagnation, self.config_file)
         population = neat.Population(config)
         population.add_reporter(neat.StdOutReporter(True))
+        self.stats_reporter = StatsReporter(self.stats_file, overwrite=self.overwrite_stats)
+        population.add_reporter(self.stats_reporter)
+        for reporter in reporters:
+            population.add_reporter(reporter)
         
         def evaluate_generation(genomes, config):
             return self.run_generation(genomes, config, screen, clock, font, track_image, finish_image)
         
         try:
-            winner = population.run(evaluate_generation, 50)
+            winner = population.run(evaluate_generation, self.generations)
             if winner:
-                with open('best_simple_ai.pkl', 'wb') as f:
+                with open(self.winner_file, 'wb') as f:
                     pickle.dump(winner, f)
             return winner
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, TrainingStopped):
             return None
         except Exception as e:
+            self.training_error = e
             print(f"Error: {e}")
             return None
+        finally:
+            self.stats_reporter.close()
@@ -0,0 +1,227 @@
+import configparser
+import math
+import pickle
+
+# Loads genomes saved by the trainer and compiles them into plain Python
+# functions. Nothing here imports neat, so driving a trained car starts fast
+# and the per-decision cost is a handful of float operations.
+
+
+def sigmoid_activation(z):
+    z = max(-60.0, min(60.0, 5.0 * z))
+    return 1.0 / (1.0 + math.exp(-z))
+
+
+def tanh_activation(z):
+    z = max(-60.0, min(60.0, 2.5 * z))
+    return math.tanh(z)
+
+
+def sin_activation(z):
+    z = max(-60.0, min(60.0, 5.0 * z))
+    return math.sin(z)
+
+
+def gauss_activation(z):
+    z = max(-3.4, min(3.4, z))
+    return math.exp(-5.0 * z ** 2)
+
+
+def relu_activation(z):
+    return z if z > 0.0 else 0.0
+
+
+def softplus_activation(z):
+    z = max(-60.0, min(60.0, 5.0 * z))
+    return 0.2 * math.log(1 + math.exp(z))
+
+
+def identity_activation(z):
+    return z
+
+
+def clamped_activation(z):
+    return max(-1.0, min(1.0, z))
+
+
+def inv_activation(z):
+    try:
+        z = 1.0 / z
+    except ArithmeticError:
+        return 0.0
+    else:
+        return z
+
+
+def log_activation(z):
+    z = max(1e-7, z)
+    return math.log(z)
+
+
+def exp_activation(z):
+    z = max(-60.0, min(60.0, z))
+    return math.exp(z)
+
+
+def abs_activation(z):
+    return abs(z)
+
+
+def hat_activation(z):
+    return max(0.0, 1 - abs(z))
+
+
+def square_activation(z):
+    return z ** 2
+
+
+def cube_activation(z):
+    return z ** 3
+
+
+# Same definitions as neat.activations, so compiled networks match training
+ACTIVATIONS = {
+    'sigmoid': sigmoid_activation,
+    'tanh': tanh_activation,
+    'sin': sin_activation,
+    'gauss': gauss_activation,
+    'relu': relu_activation,
+    'softplus': softplus_activation,
+    'identity': identity_activation,
+    'clamped': clamped_activation,
+    'inv': inv_activation,
+    'log': log_activation,
+    'exp': exp_activation,
+    'abs': abs_activation,
+    'hat': hat_activation,
+    'square': square_activation,
+    'cube': cube_activation,
+}
+
+AGGREGATIONS = {
+    'sum': ' + ',
+    'product': ' * ',
+}
+
+
+class GeneRecord:
+    # Stand-in for neat's genome and gene classes when unpickling
+    pass
+
+
+class ChampionUnpickler(pickle.Unpickler):
+    def find_class(self, module, name):
+        if module in ('neat.genome', 'neat.genes'):
+            return GeneRecord
+        if module == 'builtins' and name in ('set', 'frozenset', 'tuple', 'list', 'dict'):
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"Unexpected object in champion file: {module}.{name}")
+
+
+def load_genome(filename):
+    with open(filename, 'rb') as f:
+        return ChampionUnpickler(f).load()
+
+
+def read_network_shape(config_file):
+    parser = configparser.ConfigParser()
+    parser.read(config_file)
+    return parser.getint('DefaultGenome', 'num_inputs'), parser.getint('DefaultGenome', 'num_outputs')
+
+
+def feed_forward_order(input_keys, output_keys, connections):
+    # Node evaluation order, following neat.graphs.feed_forward_layers
+    required = set(output_keys)
+    seen = set(output_keys)
+    while True:
+        found = set(a for (a, b) in connections if b in seen and a not in seen)
+        hidden = set(x for x in found if x not in input_keys)
+        if not hidden:
+            break
+        required |= hidden
+        seen |= found
+
+    order = []
+    ready = set(input_keys)
+    while True:
+        candidates = set(b for (a, b) in connections if a in ready and b not in ready)
+        layer = set(n for n in candidates
+                    if n in required and all(a in ready for (a, b) in connections if b == n))
+        if not layer:
+            break
+        order.extend(sorted(layer))
+        ready |= layer
+    return order
+
+
+def variable(key):
+    return f"n{key}" if key >= 0 else f"i{-key}"
+
+
+class CompiledNetwork:
+    def __init__(self, genome, num_inputs, num_outputs, name=''):
+        self.name = name
+        self.fitness = genome.fitness
+        self.num_inputs = num_inputs
+        self.num_outputs = num_outputs
+        self.input_keys = [-i - 1 for i in range(num_inputs)]
+        self.output_keys = list(range(num_outputs))
+        self.source = self.generate_source(genome)
+        namespace = {f"{key}_activation": function for key, function in ACTIVATIONS.items()}
+        exec(compile(self.source, f"<champion {name}>", 'exec'), namespace)
+        self.activate = namespace['activate']
+        self.activate_batch = namespace['activate_batch']
+
+    def generate_source(self, genome):
+        connections = [cg.key for cg in genome.connections.values() if cg.enabled]
+        order = feed_forward_order(self.input_keys, self.output_keys, connections)
+        body = []
+        for node in order:
+            ng = genome.nodes[node]
+            if ng.activation not in ACTIVATIONS or ng.aggregation not in AGGREGATIONS:
+                raise ValueError(f"Unsupported node function: {ng.activation}/{ng.aggregation}")
+            terms = [f"{variable(a)} * {genome.connections[(a, b)].weight!r}"
+                     for (a, b) in connections if b == node]
+            total = AGGREGATIONS[ng.aggregation].join(terms)
+            body.append(f"{variable(node)} = {ng.activation}_activation("
+                        f"{ng.bias!r} + {ng.response!r} * ({total}))")
+
+        # Outputs with no path from the inputs stay at 0.0, as in neat
+        outputs = ", ".join(variable(k) if k in order else "0.0" for k in self.output_keys)
+        inputs = ", ".join(variable(k) for k in self.input_keys)
+
+        lines = ["def activate(inputs):", f"    {inputs}, = inputs"]
+        lines += [f"    {line}" for line in body]
+        lines += [f"    return ({outputs},)", "",
+                  "def activate_batch(rows):", "    results = []", "    append = results.append",
+                  f"    for {inputs}, in rows:"]
+        lines += [f"        {line}" for line in body]
+        lines += [f"        append(({outputs},))", "    return results", ""]
+        return "\n".join(lines)
+
+
+def load_champion(filename, config_file="neat_config.txt"):
+    num_inputs, num_outputs = read_network_shape(config_file)
+    return CompiledNetwork(load_genome(filename), num_inputs, num_outputs, name=filename)
+
+
+def sensor_inputs(car):
+    inputs = [sensor_reading / car.sensor_range for sensor_reading in car.sensor_readings]
+    inputs.append(car.speed / car.max_speed)
+    inputs.append(car.angle / 360.0)
+    return inputs
+
+
+def decision_from_outputs(outputs):
+    accelerate = outputs[0] > 0.5
+    brake = outputs[1] > 0.5
+    steering_output = outputs[2]
+
+    if steering_output < -0.33:
+        steer = -1
+    elif steering_output > 0.33:
+        steer = 1
+    else:
+        steer = 0
+
+    return (accelerate, brake, steer)
@@ -76,7 +76,7 @@ class CheckpointPlacer:
             f.write(checkpoint_code)
         
         print("\nCheckpoints saved to 'generated_checkpoints.py'")
-        print("Copy the checkpoints list to your ai_trainer.py file")
+        print("Copy the checkpoints list to TRACK1_CHECKPOINTS in environment.py, or run drive.py with --checkpoints generated_checkpoints.py")
         print("\nGenerated checkpoints:")
         for i, (x, y, radius) in enumerate(self.checkpoints):
             print(f"    ({x}, {y}, {radius}),   # Checkpoint {i + 1}")
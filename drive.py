@@ -0,0 +1,171 @@
+import argparse
+import os
+import runpy
+import time
+
+from champion import decision_from_outputs, load_champion, sensor_inputs
+from stats_math import percentile
+
+FINISH_SIZE = (160, 40)
+
+
+class LatencyRecorder:
+    # Every car in a batch waits for the whole batch, so a car's decision
+    # latency is the time of its batch: from encoding the sensor readings to
+    # having the decision. The amortized cost per car is kept separately.
+    def __init__(self):
+        self.latency_ns = []
+        self.amortized_ns = []
+
+    def record(self, elapsed_ns, batch_size):
+        self.latency_ns.append(elapsed_ns)
+        self.amortized_ns.append(elapsed_ns / batch_size)
+
+    def report(self):
+        lines = []
+        for label, samples in (("Decision latency", self.latency_ns), ("Amortized cost per car", self.amortized_ns)):
+            samples = sorted(samples)
+            values = "  ".join(f"p{p}={percentile(samples, p) / 1000:.1f}us" for p in (50, 90, 99))
+            lines.append(f"{label}: {values}  max={samples[-1] / 1000 if samples else 0:.1f}us "
+                         f"({len(samples)} batches)")
+        return lines
+
+
+class ChampionDriver:
+    # Drives many cars with one or more compiled champions. Cars that share a
+    # champion are evaluated together as one batch per frame.
+    def __init__(self, champions, assignments):
+        self.champions = champions
+        self.groups = [(champion, [i for i, assigned in enumerate(assignments) if assigned == champion_index])
+                       for champion_index, champion in enumerate(champions)]
+        self.latency = LatencyRecorder()
+
+    def decide(self, cars):
+        decisions = [None] * len(cars)
+        for champion, indices in self.groups:
+            if not indices:
+                continue
+            start = time.perf_counter_ns()
+            rows = [sensor_inputs(cars[i]) for i in indices]
+            outputs = champion.activate_batch(rows)
+            for i, output in zip(indices, outputs):
+                decisions[i] = decision_from_outputs(output)
+            self.latency.record(time.perf_counter_ns() - start, len(indices))
+        return decisions
+
+
+def load_checkpoints(filename):
+    # Accepts the generated_checkpoints.py file written by checkpoint_placer.py
+    if filename is None:
+        from environment import TRACK1_CHECKPOINTS
+        return list(TRACK1_CHECKPOINTS)
+    return list(runpy.run_path(filename)['checkpoints'])
+
+
+def draw_drive_screen(screen, font, track_image, finish_image, finish_pos, checkpoints, cars,
+                      champions, assignments, time_alive):
+    import pygame
+
+    screen.fill((0, 0, 0))
+    screen.blit(track_image, (0, 0))
+    screen.blit(finish_image, finish_pos)
+    for i, (x, y, radius) in enumerate(checkpoints):
+        color = (0, 255, 0) if i == 0 else (255, 255, 0)
+        pygame.draw.circle(screen, color, (int(x), int(y)), radius, 3)
+    for car in cars:
+        car.draw(screen)
+
+    info_texts = [f"Time: {time_alive:.1f}s"]
+    for car, champion_index in zip(cars, assignments):
+        name = os.path.basename(champions[champion_index].name)
+        info_texts.append(f"Car {car.id} ({name}): laps {car.laps_completed}, checkpoints {car.checkpoints_reached}")
+    for i, text in enumerate(info_texts):
+        screen.blit(font.render(text, True, (100, 200, 255)), (10, 10 + i * 25))
+
+
+def drive(args):
+    if args.headless:
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+    load_start = time.perf_counter()
+    champions = [load_champion(filename, args.config) for filename in args.champions]
+    load_seconds = time.perf_counter() - load_start
+
+    import pygame
+    from environment import Car
+    from main import load_track_images, setup_environment
+
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    pygame.display.set_caption("AI Racing Car - Champion Drive")
+    clock = pygame.time.Clock()
+    font = None if args.headless else pygame.font.SysFont(None, 24)
+    track_image, finish_image = load_track_images(args.track)
+    finish_pos = (int(args.finish[0]), int(args.finish[1]))
+    setup_environment(args.track, finish_pos)
+    checkpoints = load_checkpoints(args.checkpoints)
+
+    colors = [(255, 100, 100), (100, 255, 100), (100, 100, 255),
+              (255, 255, 100), (255, 100, 255), (100, 255, 255)]
+    start_x, start_y, start_angle = args.start
+    cars = []
+    assignments = []
+    for champion_index in range(len(champions)):
+        for _ in range(args.cars_per_champion):
+            car = Car(len(cars) + 1, start_x, start_y, start_angle, colors[champion_index % len(colors)])
+            car.set_checkpoints(checkpoints)
+            cars.append(car)
+            assignments.append(champion_index)
+
+    print(f"Loaded {len(champions)} champion(s) in {load_seconds * 1000:.1f} ms, driving {len(cars)} car(s)")
+    driver = ChampionDriver(champions, assignments)
+    frame = 0
+    running = True
+    while running:
+        time_alive = frame / args.fps
+        frame += 1
+        if time_alive >= args.seconds:
+            break
+
+        if not args.headless:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+
+        for car, decision in zip(cars, driver.decide(cars)):
+            car.update(decision)
+
+        if not args.headless:
+            draw_drive_screen(screen, font, track_image, finish_image, finish_pos, checkpoints, cars,
+                              champions, assignments, time_alive)
+            pygame.display.flip()
+            clock.tick(args.fps)
+
+    pygame.quit()
+    for car, champion_index in zip(cars, assignments):
+        print(f"Car {car.id} ({champions[champion_index].name}): laps {car.laps_completed}, "
+              f"checkpoints {car.checkpoints_reached}, crashed {car.crashed}")
+    for line in driver.latency.report():
+        print(line)
+    return cars
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive cars with trained champions")
+    parser.add_argument('champions', nargs='*', default=['best_simple_ai.pkl'], help="pickled champion genomes")
+    parser.add_argument('--config', default='neat_config.txt', help="NEAT config used to train the champions")
+    parser.add_argument('--track', default='./track1.png', help="track image")
+    parser.add_argument('--checkpoints', help="checkpoint file written by checkpoint_placer.py")
+    parser.add_argument('--start', type=float, nargs=3, default=(400, 360, 0), metavar=('X', 'Y', 'ANGLE'))
+    parser.add_argument('--finish', type=float, nargs=2, default=(270, 200), metavar=('X', 'Y'),
+                        help="top-left corner of the %dx%d finish line" % FINISH_SIZE)
+    parser.add_argument('--cars-per-champion', type=int, default=1)
+    parser.add_argument('--seconds', type=float, default=60, help="simulated time to drive for")
+    parser.add_argument('--fps', type=int, default=60)
+    parser.add_argument('--headless', action='store_true', help="run without opening a window")
+    drive(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,14 @@ BLUE = (0, 0, 255)
 WALL_MASK = None
 FINISH_LINE_RECT = None
 
+# Checkpoint layout for track1.png, in racing order: (x, y, radius)
+TRACK1_CHECKPOINTS = [
+    (407, 353, 50), (618, 326, 50), (782, 125, 50),
+    (944, 390, 50), (1177, 529, 50), (923, 642, 50),
+    (608, 560, 50), (362, 636, 50), (125, 520, 50),
+    (145, 281, 50), (170, 75, 50), (348, 136, 50)
+]
+
 # --- Car Class ---
 class Car(pygame.sprite.Sprite):
     def __init__(self, car_id, x, y, angle=0.0, color=BLUE): # Added car_id and color param
@@ -230,6 +238,10 @@ class Car(pygame.sprite.Sprite):
         """Set the checkpoints for this car"""
         self.checkpoints = checkpoints
     
+    def progress(self):
+        """Checkpoints reached plus laps finished, independent of fitness weights"""
+        return self.checkpoints_reached + self.laps_completed
+    
     def update_color(self, new_color):
         """Update the car's color and regenerate the image"""
         self.color = new_color
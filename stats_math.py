@@ -0,0 +1,18 @@
+import math
+
+# Small numeric helpers shared by the training statistics and the champion
+# runtime. Kept free of neat so drive.py can use them without importing it.
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * p / 100.0
+    lower = int(math.floor(position))
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def mean(values):
+    return sum(values) / len(values) if values else 0.0
@@ -0,0 +1,220 @@
+import glob
+import math
+import mmap
+import struct
+import sys
+import time
+
+import neat
+
+from stats_math import mean, percentile
+
+# File layout:
+#   magic (8 bytes) | header length (uint32) | column count (uint32)
+#   column names, newline separated, zero padded to a multiple of 8 bytes
+#   fixed-width records, one float64 per column, appended once per generation
+# Species sizes are stored largest first in MAX_SPECIES columns; if a
+# generation has more species than that, only the largest are kept
+# (species_count always holds the true count).
+MAGIC = b"CARSTAT1"
+HEADER_PREFIX = struct.Struct("<8sII")
+MAX_SPECIES = 64
+FITNESS_PERCENTILES = (0, 10, 25, 50, 75, 90, 100)
+
+COLUMNS = (
+    ["generation", "population", "fitness_mean", "fitness_stdev"]
+    + [f"fitness_p{p}" for p in FITNESS_PERCENTILES]
+    + ["species_count"]
+    + [f"species_size_{i}" for i in range(MAX_SPECIES)]
+    + ["checkpoints_mean", "checkpoints_max", "laps_mean", "laps_max",
+       "progress_mean", "progress_max",
+       "nodes_mean", "nodes_max", "connections_mean", "connections_max",
+       "best_nodes", "best_connections",
+       "time_evaluate", "time_simulate", "time_draw", "time_evolve"]
+)
+
+
+class StatsReporter(neat.reporting.BaseReporter):
+    """Appends one fixed-width record per generation to a binary stats file.
+
+    Only `chunk_size` records are held in memory before they are written
+    out, so memory use stays flat no matter how long training runs.
+    """
+
+    def __init__(self, filename, chunk_size=32, overwrite=False):
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self.row_format = struct.Struct("<" + "d" * len(COLUMNS))
+        self.pending_rows = []
+        self.current = None
+        self.generation_start = 0.0
+        self.evaluate_end = 0.0
+        # Refuse to replace the statistics of an earlier run unless asked to
+        self.file = open(filename, "wb" if overwrite else "xb")
+        self.write_header()
+
+    def write_header(self):
+        names = "\n".join(COLUMNS).encode("ascii")
+        names += b"\0" * (-(HEADER_PREFIX.size + len(names)) % 8)
+        header_length = HEADER_PREFIX.size + len(names)
+        self.file.write(HEADER_PREFIX.pack(MAGIC, header_length, len(COLUMNS)))
+        self.file.write(names)
+        self.file.flush()
+
+    def start_generation(self, generation):
+        self.current = dict.fromkeys(COLUMNS, 0.0)
+        self.current["generation"] = generation
+        self.generation_start = time.perf_counter()
+
+    def record_cars(self, cars):
+        if self.current is None or not cars:
+            return
+        checkpoints = [car.checkpoints_reached for car in cars]
+        laps = [car.laps_completed for car in cars]
+        progress = [car.progress() for car in cars]
+        self.current["checkpoints_mean"] = mean(checkpoints)
+        self.current["checkpoints_max"] = max(checkpoints)
+        self.current["laps_mean"] = mean(laps)
+        self.current["laps_max"] = max(laps)
+        self.current["progress_mean"] = mean(progress)
+        self.current["progress_max"] = max(progress)
+
+    def record_phase(self, name, seconds):
+        if self.current is not None:
+            self.current[f"time_{name}"] += seconds
+
+    def post_evaluate(self, config, population, species, best_genome):
+        self.evaluate_end = time.perf_counter()
+        record = self.current
+        record["time_evaluate"] = self.evaluate_end - self.generation_start
+
+        fitnesses = sorted(g.fitness for g in population.values() if g.fitness is not None)
+        fitness_mean = mean(fitnesses)
+        record["population"] = len(population)
+        record["fitness_mean"] = fitness_mean
+        record["fitness_stdev"] = math.sqrt(mean([(f - fitness_mean) ** 2 for f in fitnesses]))
+        for p in FITNESS_PERCENTILES:
+            record[f"fitness_p{p}"] = percentile(fitnesses, p)
+
+        sizes = sorted((len(s.members) for s in species.species.values()), reverse=True)
+        record["species_count"] = len(sizes)
+        for i, size in enumerate(sizes[:MAX_SPECIES]):
+            record[f"species_size_{i}"] = size
+
+        genome_sizes = [g.size() for g in population.values()]
+        nodes = [n for n, c in genome_sizes]
+        connections = [c for n, c in genome_sizes]
+        record["nodes_mean"] = mean(nodes)
+        record["nodes_max"] = max(nodes, default=0)
+        record["connections_mean"] = mean(connections)
+        record["connections_max"] = max(connections, default=0)
+        record["best_nodes"], record["best_connections"] = best_genome.size()
+
+    def end_generation(self, config, population, species_set):
+        if self.current is not None:
+            self.current["time_evolve"] = time.perf_counter() - self.evaluate_end
+            self.commit_record()
+
+    def found_solution(self, config, generation, best):
+        # neat stops before end_generation once the threshold is met
+        if self.current is not None:
+            self.commit_record()
+        self.flush()
+
+    def commit_record(self):
+        self.pending_rows.append(self.row_format.pack(*(self.current[c] for c in COLUMNS)))
+        self.current = None
+        if len(self.pending_rows) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending_rows:
+            self.file.write(b"".join(self.pending_rows))
+            self.pending_rows = []
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            # Keep a generation that was evaluated before training was stopped
+            if self.current is not None and self.current["population"]:
+                self.commit_record()
+            self.flush()
+            self.file.close()
+
+
+class StatsFile:
+    """Memory-mapped, read-only view of a file written by StatsReporter."""
+
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, "rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_length, column_count = HEADER_PREFIX.unpack_from(self.mmap, 0)
+        if magic != MAGIC:
+            self.mmap.close()
+            raise ValueError(f"{filename} is not a training stats file")
+        names = self.mmap[HEADER_PREFIX.size:header_length].rstrip(b"\0").decode("ascii")
+        self.columns = names.split("\n")
+        self.column_index = {name: i for i, name in enumerate(self.columns)}
+        self.row_size = 8 * column_count
+        # A run that is still training may have left a partial record at the end
+        self.rows = (len(self.mmap) - header_length) // self.row_size
+        self.body = memoryview(self.mmap)[header_length:header_length + self.rows * self.row_size]
+        self.values = self.body.cast("d", shape=[self.rows, column_count]) if self.rows else None
+
+    def __len__(self):
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def column(self, name):
+        j = self.column_index[name]
+        return [self.values[i, j] for i in range(self.rows)]
+
+    def row(self, index):
+        return {name: self.values[index, j] for name, j in self.column_index.items()}
+
+    def species_sizes(self, index):
+        count = int(self.values[index, self.column_index["species_count"]])
+        first = self.column_index["species_size_0"]
+        stored = sum(1 for name in self.columns if name.startswith("species_size_"))
+        return [int(self.values[index, first + i]) for i in range(min(count, stored))]
+
+    def close(self):
+        if self.values is not None:
+            self.values.release()
+            self.values = None
+        self.body.release()
+        self.mmap.close()
+
+
+def load_stats(filename):
+    return StatsFile(filename)
+
+
+def compare_runs(filenames, column):
+    results = {}
+    for filename in filenames:
+        with load_stats(filename) as stats:
+            results[filename] = stats.column(column)
+    return results
+
+
+def print_summary(filename):
+    with load_stats(filename) as stats:
+        print(f"{filename}: {len(stats)} generations")
+        print(f"{'gen':>5} {'best':>9} {'median':>9} {'species':>8} {'ckpts':>6} {'laps':>5} {'eval s':>7}")
+        for i in range(len(stats)):
+            row = stats.row(i)
+            print(f"{int(row['generation']):>5} {row['fitness_p100']:>9.1f} {row['fitness_p50']:>9.1f} "
+                  f"{int(row['species_count']):>8} {int(row['checkpoints_max']):>6} "
+                  f"{int(row['laps_max']):>5} {row['time_evaluate']:>7.2f}")
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or sorted(glob.glob("training_stats_*.bin")):
+        print_summary(name)
@@ -0,0 +1,280 @@
+import argparse
+import configparser
+import contextlib
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Parameter names are "<section>.<key>" for entries in neat_config.txt
+# (e.g. "DefaultGenome.conn_add_prob"), or "fitness.<weight>" and
+# "time_limits.<phase>" for the trainer attributes of the same name.
+TRAINER_PARAMS = {'fitness': 'fitness_weights', 'time_limits': 'time_limits'}
+
+# Trials may use different fitness weights, so raw fitness is not comparable
+# between them. Pruning and ranking use driving progress instead (checkpoints
+# reached plus laps finished, see Car.progress); fitness is kept for reference.
+SUMMARY_FIELDS = ['trial', 'status', 'generations', 'best_progress', 'mean_progress',
+                  'max_checkpoints', 'max_laps', 'best_fitness', 'median_fitness', 'seconds', 'error']
+
+
+def load_spec(filename):
+    with open(filename) as f:
+        spec = json.load(f)
+    spec.setdefault('mode', 'grid')
+    spec.setdefault('trials', 10)
+    spec.setdefault('seed', None)
+    spec.setdefault('generations', 30)
+    spec.setdefault('prune_after', 10)
+    spec.setdefault('min_trials', 3)
+    if spec['mode'] not in ('grid', 'random'):
+        raise ValueError(f"Unknown sweep mode: {spec['mode']}")
+    spec['defaults'] = param_defaults(spec['params'], os.path.join(PROJECT_DIR, 'neat_config.txt'))
+    for name, values in spec['params'].items():
+        if isinstance(values, dict) and not isinstance(spec['defaults'][name], (int, float)):
+            raise ValueError(f"{name} is not numeric, so it needs a list of values instead of a range")
+    return spec
+
+
+def parse_number(text):
+    for number_type in (int, float):
+        try:
+            return number_type(text)
+        except ValueError:
+            pass
+    return text
+
+
+def param_defaults(params, base_config):
+    # Current value of every swept setting; unknown names are rejected here,
+    # before any trial starts
+    from ai_trainer import SimpleAITrainer
+
+    parser = configparser.ConfigParser()
+    parser.read(base_config)
+    trainer = SimpleAITrainer()
+    defaults = {}
+    for name in params:
+        section, _, key = name.partition('.')
+        if section in TRAINER_PARAMS:
+            settings = getattr(trainer, TRAINER_PARAMS[section])
+            if key not in settings:
+                raise ValueError(f"{name} is not a trainer setting (expected one of: "
+                                 f"{', '.join(f'{section}.{k}' for k in settings)})")
+            defaults[name] = settings[key]
+        elif parser.has_option(section, key):
+            defaults[name] = parse_number(parser.get(section, key))
+        else:
+            raise ValueError(f"{name} is not in {base_config}")
+    return defaults
+
+
+def sample_value(values, default, rng):
+    # Ranges follow the type of the setting they replace, so {"min": 0, "max": 1}
+    # samples floats for a probability and integers for a population size
+    if isinstance(values, list):
+        return rng.choice(values)
+    low, high = values['min'], values['max']
+    if isinstance(default, int):
+        return rng.randint(int(low), int(high))
+    return rng.uniform(low, high)
+
+
+def generate_trials(spec):
+    params = spec['params']
+    names = sorted(params)
+    if spec['mode'] == 'grid':
+        for name in names:
+            if not isinstance(params[name], list):
+                raise ValueError(f"Grid sweeps need a list of values for {name}")
+        for values in itertools.product(*(params[name] for name in names)):
+            yield dict(zip(names, values))
+    else:
+        rng = random.Random(spec['seed'])
+        for _ in range(spec['trials']):
+            yield {name: sample_value(params[name], spec['defaults'][name], rng) for name in names}
+
+
+def write_config_variant(base_config, params, filename):
+    parser = configparser.ConfigParser()
+    parser.read(base_config)
+    for name, value in params.items():
+        section, key = name.split('.', 1)
+        if section in TRAINER_PARAMS:
+            continue
+        if not parser.has_option(section, key):
+            raise ValueError(f"{name} is not in {base_config}")
+        parser.set(section, key, str(value))
+    # fitness_threshold means something different once the weights change,
+    # so every trial runs for the full number of generations
+    parser.set('NEAT', 'no_fitness_termination', 'True')
+    with open(filename, 'w') as f:
+        parser.write(f)
+
+
+def make_pruning_reporter(trainer, trial_id, prune_after, min_trials, reported, lock):
+    import neat
+    from ai_trainer import TrainingStopped
+
+    class MedianPruningReporter(neat.reporting.BaseReporter):
+        # Stops a trial whose best progress after `prune_after` generations is
+        # below the median of the trials that already got that far.
+        def __init__(self):
+            self.generation = 0
+            self.best_progress = 0
+            self.pruned = False
+
+        def post_evaluate(self, config, population, species, best_genome):
+            self.generation += 1
+            self.best_progress = max([self.best_progress] + [car.progress() for car in trainer.cars])
+            if self.generation != prune_after:
+                return
+            with lock:
+                others = list(reported.values())
+                reported[trial_id] = self.best_progress
+            if len(others) >= min_trials and self.best_progress < statistics.median(others):
+                self.pruned = True
+                raise TrainingStopped(f"Trial {trial_id} pruned at generation {self.generation}")
+
+    return MedianPruningReporter()
+
+
+def run_trial(trial_id, params, spec, output_dir, reported, lock):
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    os.chdir(PROJECT_DIR)
+    trial_dir = os.path.join(output_dir, f"trial_{trial_id:03d}")
+    os.makedirs(trial_dir, exist_ok=True)
+
+    # Workers are reused across trials, so stdout must be restored and the
+    # log closed however the trial ends
+    with open(os.path.join(trial_dir, 'train.log'), 'w') as log, contextlib.redirect_stdout(log):
+        import pygame
+        import main
+        from ai_trainer import SimpleAITrainer
+
+        with open(os.path.join(trial_dir, 'params.json'), 'w') as f:
+            json.dump(params, f, indent=2)
+
+        trainer = SimpleAITrainer()
+        trainer.generations = spec['generations']
+        trainer.config_file = os.path.join(trial_dir, 'neat_config.txt')
+        trainer.stats_file = os.path.join(trial_dir, 'training_stats.bin')
+        trainer.overwrite_stats = True
+        trainer.winner_file = os.path.join(trial_dir, 'best_simple_ai.pkl')
+        write_config_variant(os.path.join(PROJECT_DIR, 'neat_config.txt'), params, trainer.config_file)
+        for name, value in params.items():
+            section, key = name.split('.', 1)
+            if section in TRAINER_PARAMS:
+                getattr(trainer, TRAINER_PARAMS[section])[key] = value
+
+        pruner = make_pruning_reporter(trainer, trial_id, spec['prune_after'], spec['min_trials'], reported, lock)
+        start = time.perf_counter()
+        try:
+            pygame.init()
+            pygame.display.set_mode((trainer.screen_width, trainer.screen_height))
+            main.setup_environment()
+            trainer.start_training(reporters=[pruner])
+        finally:
+            pygame.quit()
+        seconds = time.perf_counter() - start
+
+    if trainer.training_error is not None:
+        status = 'failed'
+    elif pruner.pruned:
+        status = 'pruned'
+    else:
+        status = 'completed'
+    error = str(trainer.training_error) if trainer.training_error is not None else ''
+    return summarize_trial(trial_id, params, trainer.stats_file, status, seconds, error)
+
+
+def summarize_trial(trial_id, params, stats_file, status, seconds, error=''):
+    from stats_store import load_stats
+
+    row = dict.fromkeys(SUMMARY_FIELDS, 0)
+    row.update(params)
+    row.update(trial=trial_id, status=status, seconds=round(seconds, 1), error=error)
+    with load_stats(stats_file) as stats:
+        if len(stats):
+            row['generations'] = len(stats)
+            row['best_progress'] = int(max(stats.column('progress_max')))
+            row['mean_progress'] = round(stats.column('progress_mean')[-1], 2)
+            row['best_fitness'] = round(max(stats.column('fitness_p100')), 2)
+            row['median_fitness'] = round(stats.column('fitness_p50')[-1], 2)
+            row['max_checkpoints'] = int(max(stats.column('checkpoints_max')))
+            row['max_laps'] = int(max(stats.column('laps_max')))
+    return row
+
+
+def run_sweep(spec, output_dir, workers):
+    os.makedirs(output_dir, exist_ok=True)
+    output_dir = os.path.abspath(output_dir)
+    trials = list(generate_trials(spec))
+    param_names = sorted(spec['params'])
+    print(f"Running {len(trials)} trials on {workers} worker processes")
+
+    results = []
+    with multiprocessing.Manager() as manager:
+        reported = manager.dict()
+        lock = manager.Lock()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_trial, i, params, spec, output_dir, reported, lock): (i, params)
+                       for i, params in enumerate(trials)}
+            for future in as_completed(futures):
+                trial_id, params = futures[future]
+                try:
+                    row = future.result()
+                except Exception as e:
+                    row = dict.fromkeys(SUMMARY_FIELDS, 0)
+                    row.update(params, trial=trial_id, status='failed', error=str(e))
+                results.append(row)
+                if row['status'] == 'failed':
+                    print(f"Trial {trial_id} failed: {row['error']}")
+                else:
+                    print(f"Trial {trial_id} {row['status']}: best progress {row['best_progress']}")
+
+    results.sort(key=lambda row: (row['best_progress'], row['mean_progress']), reverse=True)
+    with open(os.path.join(output_dir, 'summary.csv'), 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS + param_names)
+        writer.writeheader()
+        writer.writerows(results)
+    return results
+
+
+def print_results(results, param_names):
+    print(f"{'trial':>5} {'status':>9} {'gens':>5} {'progress':>8} {'mean':>6} {'ckpts':>6} {'laps':>5} "
+          f"{'fitness':>9}  params")
+    for row in results:
+        params = ", ".join(f"{name}={row[name]}" for name in param_names)
+        print(f"{row['trial']:>5} {row['status']:>9} {row['generations']:>5} {row['best_progress']:>8} "
+              f"{row['mean_progress']:>6} {row['max_checkpoints']:>6} {row['max_laps']:>5} "
+              f"{row['best_fitness']:>9}  {params}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a hyperparameter sweep of headless training runs")
+    parser.add_argument('spec', help="JSON sweep specification")
+    parser.add_argument('--output', default='sweep_results', help="directory for trial outputs and summary.csv")
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 1) - 1),
+                        help="number of trials run in parallel (capped at the CPU count)")
+    args = parser.parse_args()
+
+    try:
+        spec = load_spec(args.spec)
+    except ValueError as e:
+        parser.error(str(e))
+    workers = max(1, min(args.workers, os.cpu_count() or 1))
+    results = run_sweep(spec, args.output, workers)
+    print_results(results, sorted(spec['params']))
+
+
+if __name__ == "__main__":
+    main()